@@ -7,10 +7,17 @@ lightweight utilities to mutate a magazine layout in response to tool calls.
 
 from __future__ import annotations
 
-import re
-from copy import deepcopy
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+import math
+import sys
+from collections import deque
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 DEFAULT_LAYER_ID = "layer-main"
 DEFAULT_LAYER_NAME = "Layer 1"
@@ -38,38 +45,140 @@ DEFAULT_CHAT_THEME = {
     },
 }
 CHAT_ALIGNMENTS = {"left", "center", "right"}
+_ID_ALLOWED_BYTES = frozenset(b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ._-")
+# Maps every byte outside the id alphabet to NUL so runs of them can be collapsed to "-".
+_ID_BYTE_TABLE = bytes(byte if byte in _ID_ALLOWED_BYTES else 0 for byte in range(256))
+
+
+def _canonical_tokens(*words: str) -> Dict[str, str]:
+    return {variant: word for word in words for variant in (word, word.capitalize(), word.upper())}
+
+
+_BLOCK_TYPE_CANON = _canonical_tokens("body", "headline", "image", "pullquote", "sidebar", "caption", "stat", "text")
+_ALIGNMENT_CANON = _canonical_tokens("left", "center", "right", "justify")
+_ORIENTATION_CANON = _canonical_tokens("portrait", "landscape")
+_BUBBLE_TARGET_CANON = _canonical_tokens("assistant", "user", "both", "all")
+
+
+def _canonical_token(value: Any, table: Dict[str, str]) -> str:
+    """Lower-case and strip ``value``, resolving common spellings with one dict lookup."""
+    if type(value) is str:
+        token = table.get(value)
+        if token is not None:
+            return token
+    return sys.intern(str(value).strip().lower())
+
+
+def _clone_default_chat_theme() -> Dict[str, Dict[str, Any]]:
+    # Bubble themes only hold str/float leaves, so one level of dict copies is enough.
+    return {
+        "assistant": dict(DEFAULT_CHAT_THEME["assistant"]),
+        "user": dict(DEFAULT_CHAT_THEME["user"]),
+    }
+
+
+def _clone_json(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _clone_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clone_json(item) for item in value]
+    return value
+
+
+def _has_non_finite(value: Any) -> bool:
+    kind = type(value)
+    if kind is float:
+        return not math.isfinite(value)
+    if kind is dict:
+        value = value.values()
+    elif kind is not list and kind is not tuple:
+        return False
+    for item in value:
+        if _has_non_finite(item):
+            return True
+    return False
+
+
+def _fast_clone(value: Any) -> Any:
+    """Deep-copy JSON-shaped data (dicts, lists, and scalar leaves)."""
+    if orjson is not None:
+        try:
+            blob = orjson.dumps(value)
+        except TypeError:
+            blob = None
+        # orjson writes NaN/Infinity as null, so only walk for them when a null shows up.
+        if blob is not None and (b"null" not in blob or not _has_non_finite(value)):
+            return orjson.loads(blob)
+    return _clone_json(value)
 
 
 def _coerce_float(value: Any, fallback: float) -> float:
+    # JSON numbers arrive as exact float/int, so check those before float()'s try/except.
+    kind = type(value)
+    if kind is float:
+        return value
+    if kind is int:
+        return float(value)
     try:
-        number = float(value)
+        return float(value)
     except (TypeError, ValueError):
         return float(fallback)
-    if not number and number != 0:
-        return float(fallback)
-    return float(number)
 
 
 def _coerce_int(value: Any, fallback: int) -> int:
+    if type(value) is int:
+        return value
     try:
-        number = int(float(value))
+        return int(float(value))
     except (TypeError, ValueError):
         return int(fallback)
-    return int(number)
+
+
+def _coerce_float_clamped(value: Any, fallback: float, lo: float, hi: float) -> float:
+    if type(value) is float:
+        number = value
+    else:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            number = float(fallback)
+    if number > hi:
+        return hi
+    if number >= lo:
+        return number
+    return lo
+
+
+def _coerce_int_clamped(value: Any, fallback: int, lo: int, hi: int) -> int:
+    if type(value) is int:
+        number = value
+    else:
+        try:
+            number = int(float(value))
+        except (TypeError, ValueError):
+            number = int(fallback)
+    if number > hi:
+        return hi
+    if number < lo:
+        return lo
+    return number
 
 
 def _normalize_block_id(value: Any, fallback_prefix: str = "block") -> str:
     text = str(value or "").strip()
     if not text:
         text = fallback_prefix
-    normalized = re.sub(r"[^0-9a-zA-Z._-]+", "-", text).strip(".-_")
+    mapped = text.encode("utf-8", "replace").translate(_ID_BYTE_TABLE)
+    if b"\0" in mapped:
+        mapped = b"-".join(filter(None, mapped.split(b"\0")))
+    normalized = mapped.decode("ascii").strip(".-_")
     if not normalized:
         normalized = fallback_prefix
     return normalized[:64]
 
 
 def _ensure_layer_payload(layer: Dict[str, Any], order: int) -> Dict[str, Any]:
-    identifier = str(layer.get("id") or "").strip() or DEFAULT_LAYER_ID
+    identifier = sys.intern(str(layer.get("id") or "").strip() or DEFAULT_LAYER_ID)
     name = str(layer.get("name") or "").strip() or DEFAULT_LAYER_NAME
     return {
         "id": identifier,
@@ -78,9 +187,8 @@ def _ensure_layer_payload(layer: Dict[str, Any], order: int) -> Dict[str, Any]:
     }
 
 
-def _default_layout(project: str) -> Dict[str, Any]:
-    return {
-        "project": project,
+_DEFAULT_LAYOUT_SCALARS: Mapping[str, Any] = MappingProxyType(
+    {
         "columns": DEFAULT_COLUMNS,
         "baseline": DEFAULT_BASELINE,
         "gutter": DEFAULT_GUTTER,
@@ -88,74 +196,84 @@ def _default_layout(project: str) -> Dict[str, Any]:
         "zoom": 1.0,
         "orientation": DEFAULT_ORIENTATION,
         "format": DEFAULT_FORMAT,
-        "dimensions": {"width": 794, "height": 1123},
-        "blocks": [],
-        "layers": [
-            {
-                "id": DEFAULT_LAYER_ID,
-                "name": DEFAULT_LAYER_NAME,
-                "order": 0,
-            }
-        ],
-        "activeLayer": DEFAULT_LAYER_ID,
-        "chatTheme": deepcopy(DEFAULT_CHAT_THEME),
     }
+)
+
+
+def _default_layout(project: str) -> Dict[str, Any]:
+    layout = {"project": project, **_DEFAULT_LAYOUT_SCALARS}
+    layout["dimensions"] = {"width": 794, "height": 1123}
+    layout["blocks"] = []
+    layout["layers"] = [{"id": DEFAULT_LAYER_ID, "name": DEFAULT_LAYER_NAME, "order": 0}]
+    layout["activeLayer"] = DEFAULT_LAYER_ID
+    layout["chatTheme"] = _clone_default_chat_theme()
+    return layout
+
+
+_LAYOUT_EVENT_KEYS = ("columns", "baseline", "gutter", "orientation", "format")
+_POSITION_DEFAULTS = (("left", 96.0), ("top", 96.0), ("width", 320.0), ("height", 200.0))
+_DEFAULT_POSITION: Mapping[str, float] = MappingProxyType(dict(_POSITION_DEFAULTS))
+_TYPOGRAPHY_SANITIZERS = (
+    ("fontSize", lambda value: _coerce_float(value, 18)),
+    ("lineHeight", lambda value: _coerce_float(value, 1.4)),
+    ("textAlign", lambda value: _canonical_token(value, _ALIGNMENT_CANON) or "left"),
+    ("textColor", lambda value: str(value).strip()),
+    ("uppercase", bool),
+)
 
 
 def _sanitize_position(position: Optional[Dict[str, Any]]) -> Dict[str, float]:
-    position = position or {}
-    return {
-        "left": _coerce_float(position.get("left"), 96),
-        "top": _coerce_float(position.get("top"), 96),
-        "width": _coerce_float(position.get("width"), 320),
-        "height": _coerce_float(position.get("height"), 200),
-    }
+    if not position:
+        return dict(_DEFAULT_POSITION)
+    return {key: _coerce_float(position.get(key), default) for key, default in _POSITION_DEFAULTS}
 
 
 def _sanitize_typography(payload: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    if not isinstance(payload, dict):
+    if not isinstance(payload, dict) or not payload:
         return None
-    typography: Dict[str, Any] = {}
-    if "fontSize" in payload:
-        typography["fontSize"] = _coerce_float(payload["fontSize"], 18)
-    if "lineHeight" in payload:
-        typography["lineHeight"] = _coerce_float(payload["lineHeight"], 1.4)
-    if "textAlign" in payload:
-        typography["textAlign"] = str(payload["textAlign"]).strip().lower() or "left"
-    if "textColor" in payload:
-        typography["textColor"] = str(payload["textColor"]).strip()
-    if "uppercase" in payload:
-        typography["uppercase"] = bool(payload["uppercase"])
+    typography = {key: sanitize(payload[key]) for key, sanitize in _TYPOGRAPHY_SANITIZERS if key in payload}
     return typography or None
 
 
-def _select_layer_identifier(requested: Optional[str], layers: List[Dict[str, Any]]) -> str:
+def _clone_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    # Handlers only reassign block fields or replace the nested position/typography
+    # dicts, so copying those two levels keeps the caller's layout untouched.
+    clone = dict(block)
+    for key in ("position", "typography"):
+        if isinstance(clone.get(key), dict):
+            clone[key] = dict(clone[key])
+    return clone
+
+
+def _select_layer_identifier(
+    requested: Optional[str], layers: List[Dict[str, Any]], layer_index: Dict[str, Dict[str, Any]]
+) -> str:
     if isinstance(requested, str) and requested.strip():
         candidate = requested.strip()
-        for layer in layers:
-            if layer.get("id") == candidate:
-                return candidate
+        if candidate in layer_index:
+            return candidate
     if layers:
-        return str(layers[0].get("id") or DEFAULT_LAYER_ID)
+        return layers[0]["id"]
     return DEFAULT_LAYER_ID
 
 
 def _sanitize_alignment(value: Any, fallback: str) -> str:
     if isinstance(value, str):
-        token = value.strip().lower()
+        token = _canonical_token(value, _ALIGNMENT_CANON)
         if token in CHAT_ALIGNMENTS:
             return token
     return fallback
 
 
 def _sanitize_max_width(value: Any, fallback: float) -> float:
-    number = _coerce_float(value, fallback)
-    return max(10.0, min(number, 100.0))
+    return _coerce_float_clamped(value, fallback, 10.0, 100.0)
 
 
 def _normalize_chat_theme(theme: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
-    base = deepcopy(DEFAULT_CHAT_THEME)
-    if not isinstance(theme, dict):
+    base = _clone_default_chat_theme()
+    if not isinstance(theme, dict) or theme is DEFAULT_CHAT_THEME:
+        return base
+    if not (theme.get("assistant") or theme.get("user")):
         return base
     for role in ("assistant", "user"):
         current = theme.get(role)
@@ -169,7 +287,7 @@ def _normalize_chat_theme(theme: Optional[Dict[str, Any]]) -> Dict[str, Dict[str
         if current.get("textColor") is not None:
             role_theme["textColor"] = str(current["textColor"])
         if "fontSize" in current:
-            role_theme["fontSize"] = max(8.0, min(_coerce_float(current["fontSize"], role_theme["fontSize"]), 48.0))
+            role_theme["fontSize"] = _coerce_float_clamped(current["fontSize"], role_theme["fontSize"], 8.0, 48.0)
         if "maxWidth" in current:
             role_theme["maxWidth"] = _sanitize_max_width(current["maxWidth"], role_theme["maxWidth"])
         if "alignment" in current:
@@ -177,13 +295,22 @@ def _normalize_chat_theme(theme: Optional[Dict[str, Any]]) -> Dict[str, Dict[str
     return base
 
 
-@dataclass
+def _changed_fields(target: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in updates.items() if key not in target or target[key] != value}
+
+
+@dataclass(slots=True)
 class ToolEvent:
     """Represents an executed tool call for UI summaries."""
 
     type: str
     description: str
-    payload: Dict[str, Any] = field(default_factory=dict)
+    payload_factory: Optional[Callable[[], Dict[str, Any]]] = None
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        """Build the event payload on demand; plain-text summaries never need it."""
+        return self.payload_factory() if self.payload_factory else {}
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -204,22 +331,37 @@ class LayoutSession:
     def __init__(self, layout: Optional[Dict[str, Any]], *, project: str) -> None:
         base = _default_layout(project)
         if isinstance(layout, dict):
-            merged = deepcopy(layout)
-            base.update({k: merged.get(k, v) for k, v in base.items() if k != "blocks"})
-            base["blocks"] = deepcopy(merged.get("blocks") or [])
-            layers = merged.get("layers")
-            if isinstance(layers, list) and layers:
-                base["layers"] = [
-                    _ensure_layer_payload(layer, index)
-                    for index, layer in enumerate(layers)
-                    if isinstance(layer, dict)
-                ] or base["layers"]
-            base["activeLayer"] = str(merged.get("activeLayer") or base["layers"][0]["id"])
-            base["chatTheme"] = _normalize_chat_theme(merged.get("chatTheme"))
+            base.update({k: layout.get(k, v) for k, v in base.items() if k != "blocks"})
+            if isinstance(base["dimensions"], dict):
+                base["dimensions"] = dict(base["dimensions"])
+            base["blocks"] = [_clone_block(block) for block in layout.get("blocks") or [] if isinstance(block, dict)]
+            layers = layout.get("layers")
+            # Always rebuild the list so the session never shares it with the caller's layout.
+            base["layers"] = [
+                _ensure_layer_payload(layer, index)
+                for index, layer in enumerate(layers if isinstance(layers, list) else [])
+                if isinstance(layer, dict)
+            ] or [{"id": DEFAULT_LAYER_ID, "name": DEFAULT_LAYER_NAME, "order": 0}]
+            base["activeLayer"] = str(layout.get("activeLayer") or base["layers"][0]["id"])
+            base["chatTheme"] = _normalize_chat_theme(layout.get("chatTheme"))
         self.project = project
         self.layout = base
         self.modified = False
-        self.events: List[ToolEvent] = []
+        self.events: Deque[ToolEvent] = deque()
+        self._block_index: Dict[str, Dict[str, Any]] = {}
+        self._id_counters: Dict[str, int] = {}
+        unnamed = []
+        for block in base["blocks"]:
+            if block.get("id"):
+                self._block_index.setdefault(block["id"], block)
+            else:
+                unnamed.append(block)
+        for block in unnamed:
+            block["id"] = self._next_unique_id(block.get("type"))
+            self._block_index[block["id"]] = block
+        self._layer_index: Dict[str, Dict[str, Any]] = {}
+        for layer in base["layers"]:
+            self._layer_index.setdefault(layer["id"], layer)
 
     # ------------------------------------------------------------------ utils
     def _mark_modified(self, event: ToolEvent) -> None:
@@ -227,44 +369,39 @@ class LayoutSession:
         self.events.append(event)
 
     def _next_unique_id(self, preferred: Optional[str] = None) -> str:
-        existing = {block.get("id") for block in self.layout["blocks"]}
+        existing = self._block_index
         base_id = _normalize_block_id(preferred, "block")
         if base_id not in existing:
             return base_id
-        counter = 2
-        while True:
-            candidate = f"{base_id}-{counter}"
-            if candidate not in existing:
-                return candidate
+        counter = self._id_counters.get(base_id, 2)
+        while f"{base_id}-{counter}" in existing:
             counter += 1
+        self._id_counters[base_id] = counter + 1
+        return f"{base_id}-{counter}"
 
     def _find_block(self, block_id: str) -> Optional[Dict[str, Any]]:
-        for block in self.layout["blocks"]:
-            if block.get("id") == block_id:
-                return block
-        return None
+        return self._block_index.get(block_id)
 
     def _ensure_layer(self, layer_id: str, name: Optional[str] = None) -> str:
+        layer = self._layer_index.get(layer_id)
+        if layer is not None:
+            if name:
+                layer["name"] = name
+            return layer["id"]
         layers = self.layout["layers"]
-        for layer in layers:
-            if layer.get("id") == layer_id:
-                if name:
-                    layer["name"] = name
-                return layer_id
         layer_payload = _ensure_layer_payload({"id": layer_id, "name": name}, len(layers))
         layers.append(layer_payload)
+        self._layer_index.setdefault(layer_payload["id"], layer_payload)
         return layer_payload["id"]
 
     # ---------------------------------------------------------------- handlers
     def create_block(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        block_type = str(payload.get("type") or payload.get("block_type") or "body").strip().lower()
-        if not block_type:
-            block_type = "body"
+        block_type = _canonical_token(payload.get("type") or payload.get("block_type") or "body", _BLOCK_TYPE_CANON) or "body"
         block_id = self._next_unique_id(payload.get("id"))
         position = _sanitize_position(payload.get("position"))
         typography = _sanitize_typography(payload.get("typography"))
         target_layer = self._ensure_layer(
-            _select_layer_identifier(payload.get("layer"), self.layout["layers"])
+            _select_layer_identifier(payload.get("layer"), self.layout["layers"], self._layer_index)
         )
 
         block = {
@@ -275,17 +412,18 @@ class LayoutSession:
             "locked": bool(payload.get("locked", False)),
             "layer": target_layer,
             "layerZ": _coerce_int(payload.get("layerZ"), 0),
-            "opacity": max(0.05, min(_coerce_float(payload.get("opacity"), 1.0), 1.0)),
+            "opacity": _coerce_float_clamped(payload.get("opacity"), 1.0, 0.05, 1.0),
             "background": str(payload.get("background") or "").strip(),
             "typography": typography,
             "content": payload.get("content"),
         }
         self.layout["blocks"].append(block)
+        self._block_index[block_id] = block
         self._mark_modified(
             ToolEvent(
                 type="create_block",
                 description=f"Added {block_type} block “{block_id}”.",
-                payload={"blockId": block_id, "layer": target_layer},
+                payload_factory=lambda: {"blockId": block_id, "layer": target_layer},
             )
         )
         return {"status": "success", "block": block}
@@ -298,32 +436,38 @@ class LayoutSession:
         if not block:
             return {"status": "error", "error": f"block '{block_id}' not found"}
 
+        updates: Dict[str, Any] = {}
         if "type" in payload or "block_type" in payload:
-            block["type"] = str(payload.get("type") or payload.get("block_type") or block["type"]).strip().lower()
+            updates["type"] = _canonical_token(payload.get("type") or payload.get("block_type") or block["type"], _BLOCK_TYPE_CANON)
         if payload.get("position"):
-            block["position"] = _sanitize_position(payload["position"])
+            updates["position"] = _sanitize_position(payload["position"])
         if "rotation" in payload:
-            block["rotation"] = _coerce_float(payload["rotation"], block.get("rotation", 0))
+            updates["rotation"] = _coerce_float(payload["rotation"], block.get("rotation", 0))
         if "locked" in payload:
-            block["locked"] = bool(payload["locked"])
+            updates["locked"] = bool(payload["locked"])
         if "layer" in payload:
-            block["layer"] = self._ensure_layer(str(payload["layer"]).strip() or DEFAULT_LAYER_ID)
+            updates["layer"] = self._ensure_layer(str(payload["layer"]).strip() or DEFAULT_LAYER_ID)
         if "layerZ" in payload:
-            block["layerZ"] = _coerce_int(payload["layerZ"], block.get("layerZ", 0))
+            updates["layerZ"] = _coerce_int(payload["layerZ"], block.get("layerZ", 0))
         if "opacity" in payload:
-            block["opacity"] = max(0.05, min(_coerce_float(payload["opacity"], block.get("opacity", 1.0)), 1.0))
+            updates["opacity"] = _coerce_float_clamped(payload["opacity"], block.get("opacity", 1.0), 0.05, 1.0)
         if "background" in payload:
-            block["background"] = str(payload["background"]).strip()
+            updates["background"] = str(payload["background"]).strip()
         if "content" in payload:
-            block["content"] = payload["content"]
+            updates["content"] = payload["content"]
         if "typography" in payload:
-            block["typography"] = _sanitize_typography(payload["typography"])
+            updates["typography"] = _sanitize_typography(payload["typography"])
+
+        changes = _changed_fields(block, updates)
+        if not changes:
+            return {"status": "noop", "block": block}
+        block.update(changes)
 
         self._mark_modified(
             ToolEvent(
                 type="update_block",
                 description=f"Updated block “{block_id}”.",
-                payload={"blockId": block_id},
+                payload_factory=lambda: {"blockId": block_id},
             )
         )
         return {"status": "success", "block": block}
@@ -332,47 +476,55 @@ class LayoutSession:
         block_id = str(payload.get("id") or payload.get("block_id") or "").strip()
         if not block_id:
             return {"status": "error", "error": "block id required"}
-        before = len(self.layout["blocks"])
-        self.layout["blocks"] = [block for block in self.layout["blocks"] if block.get("id") != block_id]
-        if len(self.layout["blocks"]) == before:
+        block = self._block_index.pop(block_id, None)
+        if block is None:
             return {"status": "error", "error": f"block '{block_id}' not found"}
+        # Duplicate ids share one index entry, so drop every block carrying the id.
+        blocks = self.layout["blocks"]
+        blocks[:] = [item for item in blocks if item.get("id") != block_id]
         self._mark_modified(
             ToolEvent(
                 type="delete_block",
                 description=f"Deleted block “{block_id}”.",
-                payload={"blockId": block_id},
+                payload_factory=lambda: {"blockId": block_id},
             )
         )
         return {"status": "success"}
 
     def update_layout(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         layout = self.layout
+        updates: Dict[str, Any] = {}
         if "columns" in payload:
-            layout["columns"] = max(1, min(_coerce_int(payload["columns"], layout.get("columns", DEFAULT_COLUMNS)), 12))
+            updates["columns"] = _coerce_int_clamped(payload["columns"], layout.get("columns", DEFAULT_COLUMNS), 1, 12)
         if "baseline" in payload:
-            layout["baseline"] = max(4, min(_coerce_int(payload["baseline"], layout.get("baseline", DEFAULT_BASELINE)), 64))
+            updates["baseline"] = _coerce_int_clamped(payload["baseline"], layout.get("baseline", DEFAULT_BASELINE), 4, 64)
         if "gutter" in payload:
-            layout["gutter"] = max(0, min(_coerce_int(payload["gutter"], layout.get("gutter", DEFAULT_GUTTER)), 256))
+            updates["gutter"] = _coerce_int_clamped(payload["gutter"], layout.get("gutter", DEFAULT_GUTTER), 0, 256)
         if "snap" in payload:
-            layout["snap"] = bool(payload["snap"])
+            updates["snap"] = bool(payload["snap"])
         if "orientation" in payload:
-            layout["orientation"] = str(payload["orientation"]).strip().lower() or layout.get("orientation", DEFAULT_ORIENTATION)
+            updates["orientation"] = _canonical_token(payload["orientation"], _ORIENTATION_CANON) or layout.get("orientation", DEFAULT_ORIENTATION)
         if "format" in payload:
-            layout["format"] = str(payload["format"]).strip() or layout.get("format", DEFAULT_FORMAT)
+            updates["format"] = str(payload["format"]).strip() or layout.get("format", DEFAULT_FORMAT)
         if "dimensions" in payload and isinstance(payload["dimensions"], dict):
             width = _coerce_float(payload["dimensions"].get("width"), layout["dimensions"]["width"])
             height = _coerce_float(payload["dimensions"].get("height"), layout["dimensions"]["height"])
-            layout["dimensions"] = {"width": max(120, width), "height": max(120, height)}
+            updates["dimensions"] = {"width": max(120, width), "height": max(120, height)}
+        layer_count = len(layout["layers"])
         if "activeLayer" in payload:
-            layout["activeLayer"] = self._ensure_layer(str(payload["activeLayer"]).strip() or DEFAULT_LAYER_ID)
+            updates["activeLayer"] = self._ensure_layer(str(payload["activeLayer"]).strip() or DEFAULT_LAYER_ID)
+
+        changes = _changed_fields(layout, updates)
+        # _ensure_layer may have appended a layer even when no setting changed.
+        if not changes and len(layout["layers"]) == layer_count:
+            return {"status": "noop", "layout": layout}
+        layout.update(changes)
+        settings = tuple(layout.get(key) for key in _LAYOUT_EVENT_KEYS)
         self._mark_modified(
             ToolEvent(
                 type="update_layout",
                 description="Adjusted layout settings.",
-                payload={
-                    key: layout.get(key)
-                    for key in ("columns", "baseline", "gutter", "orientation", "format")
-                },
+                payload_factory=lambda: dict(zip(_LAYOUT_EVENT_KEYS, settings)),
             )
         )
         return {"status": "success", "layout": layout}
@@ -387,21 +539,22 @@ class LayoutSession:
             ToolEvent(
                 type="ensure_layer",
                 description=f"Ensured layer “{identifier}”.",
-                payload={"layerId": identifier},
+                payload_factory=lambda: {"layerId": identifier},
             )
         )
         return {"status": "success", "layer": identifier}
 
     def snapshot(self) -> Dict[str, Any]:
-        return deepcopy(self.layout)
+        """Return a detached copy of the layout; layouts are JSON-only data."""
+        return _fast_clone(self.layout)
 
     def style_chat_bubble(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        role = str(payload.get("target") or "assistant").strip().lower()
+        role = _canonical_token(payload.get("target") or "assistant", _BUBBLE_TARGET_CANON)
         if role not in {"assistant", "user", "both", "all"}:
             role = "assistant"
         targets = ["assistant", "user"] if role in {"both", "all"} else [role]
-        theme = self.layout.setdefault("chatTheme", deepcopy(DEFAULT_CHAT_THEME))
-        theme = _normalize_chat_theme(theme)
+        previous = self.layout.get("chatTheme")
+        theme = _normalize_chat_theme(previous)
         self.layout["chatTheme"] = theme
 
         for target in targets:
@@ -413,35 +566,38 @@ class LayoutSession:
             if payload.get("textColor") is not None:
                 bubble_theme["textColor"] = str(payload["textColor"])
             if payload.get("fontSize") is not None:
-                bubble_theme["fontSize"] = max(8.0, min(_coerce_float(payload["fontSize"], bubble_theme["fontSize"]), 48.0))
+                bubble_theme["fontSize"] = _coerce_float_clamped(payload["fontSize"], bubble_theme["fontSize"], 8.0, 48.0)
             if payload.get("maxWidth") is not None:
                 bubble_theme["maxWidth"] = _sanitize_max_width(payload["maxWidth"], bubble_theme["maxWidth"])
             if payload.get("alignment") is not None:
                 bubble_theme["alignment"] = _sanitize_alignment(payload["alignment"], bubble_theme["alignment"])
+        if theme == previous:
+            return {"status": "noop", "chatTheme": theme}
 
         self._mark_modified(
             ToolEvent(
                 type="style_chat_bubble",
                 description=f"Updated chat bubble styling for {', '.join(targets)}.",
-                payload={"targets": targets},
+                payload_factory=lambda: {"targets": targets},
             )
         )
         return {"status": "success", "chatTheme": theme}
 
     # --------------------------------------------------------------- execution
+    _HANDLERS = {
+        "create_block": create_block,
+        "update_block": update_block,
+        "delete_block": delete_block,
+        "update_layout": update_layout,
+        "ensure_layer": ensure_layer,
+        "style_chat_bubble": style_chat_bubble,
+    }
+
     def execute_tool(self, name: str, arguments: Dict[str, Any], call_id: Optional[str] = None) -> Dict[str, Any]:
-        handlers = {
-            "create_block": self.create_block,
-            "update_block": self.update_block,
-            "delete_block": self.delete_block,
-            "update_layout": self.update_layout,
-            "ensure_layer": self.ensure_layer,
-            "style_chat_bubble": self.style_chat_bubble,
-        }
-        handler = handlers.get(name)
+        handler = self._HANDLERS.get(name)
         if not handler:
             return {"status": "error", "error": f"unknown tool '{name}'"}
-        return handler(arguments or {})
+        return handler(self, arguments or {})
 
 
 TOOL_DEFINITIONS: List[Dict[str, Any]] = [
@@ -617,7 +773,7 @@ TOOL_DEFINITIONS: List[Dict[str, Any]] = [
 ]
 
 
-def summarize_events(events: List[ToolEvent]) -> str:
+def summarize_events(events: Sequence[ToolEvent]) -> str:
     """
     Produce a plain-text summary suitable for displaying under the assistant reply.
     """
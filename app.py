@@ -1,26 +1,83 @@
+import hashlib
 import json
+import mimetypes
+import os
 import re
+import shutil
+import threading
+import time
 from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import quote
 from uuid import uuid4
 
-from flask import Flask, jsonify, render_template, request, send_from_directory, url_for
+from flask import Flask, abort, jsonify, render_template, request, send_from_directory, url_for
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from agent_tools import LayoutSession, TOOL_DEFINITIONS
 from core import remote_chat, DEFAULT_MODEL
 from snapshot import snapshot_for_project
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serve jsonify/request JSON through orjson, which emits UTF-8 bytes directly."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+            mimetype=self.mimetype,
+        )
+
+
 app = Flask(__name__, template_folder="templates", static_folder="static")
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+# Let Apache/lighttpd stream files via X-Sendfile when the deployment supports it.
+app.config["USE_X_SENDFILE"] = os.getenv("FIONA_USE_X_SENDFILE") == "1"
 
 BASE_DIR = Path(app.root_path)
 PROJECTS_ROOT = BASE_DIR / "projects"
 DEFAULT_PROJECT = "default"
+_PROJECT_NAME_UNSAFE_RE = re.compile(r"[^0-9a-z._-]+")
 ASSET_ROUTE = "serve_project_asset"
+UPLOAD_COPY_BUFFER = 8 * 1024 * 1024
+# Uploaded media gets a unique suffix per file, so responses can be cached as immutable.
+ASSET_MAX_AGE = 31536000
+# nginx internal location mapped onto PROJECTS_ROOT (e.g. "/_internal_assets"); unset serves from Flask.
+ASSET_ACCEL_PREFIX = (os.getenv("FIONA_ASSET_ACCEL_PREFIX") or "").rstrip("/")
 
 PROJECTS_ROOT.mkdir(parents=True, exist_ok=True)
 
+# Directories already created by this process; skips a mkdir syscall per helper call.
+_ENSURED_DIRS: Set[Path] = {PROJECTS_ROOT}
+_ENSURED_DIRS_LOCK = threading.Lock()
+
+# Normalized layouts keyed by layout.json path, tagged with the file's (mtime_ns, size, blake2b digest).
+_LAYOUT_CACHE: Dict[Path, Tuple[int, int, bytes, Dict[str, Any]]] = {}
+_LAYOUT_CACHE_LOCK = threading.Lock()
+
+# Project listing is re-scanned at most every PROJECT_LIST_TTL seconds; new project folders are added eagerly.
+PROJECT_LIST_TTL = 5.0
+_PROJECT_NAMES: Set[str] = set()
+_PROJECT_NAMES_STAMP = 0.0
+_PROJECT_NAMES_LOCK = threading.Lock()
+
 DEFAULT_LAYOUT: Dict[str, Any] = {
     "columns": 3,
     "baseline": 24,
@@ -45,30 +102,52 @@ DEFAULT_LAYOUT: Dict[str, Any] = {
 # ---------------------------------------------------------------------------
 # helpers
 # ---------------------------------------------------------------------------
+@lru_cache(maxsize=256)
 def sanitize_project(name: str) -> str:
     text = (name or "").strip().lower()
     if not text:
         return DEFAULT_PROJECT
-    text = re.sub(r"[^0-9a-z._-]+", "-", text)
+    text = _PROJECT_NAME_UNSAFE_RE.sub("-", text)
     return text.strip(".-_") or DEFAULT_PROJECT
 
 
-def project_dir(name: str) -> Path:
-    folder = PROJECTS_ROOT / sanitize_project(name)
-    folder.mkdir(parents=True, exist_ok=True)
+def _ensure_dir(folder: Path) -> Path:
+    if folder not in _ENSURED_DIRS:
+        folder.mkdir(parents=True, exist_ok=True)
+        with _ENSURED_DIRS_LOCK:
+            _ENSURED_DIRS.add(folder)
     return folder
 
 
+def project_dir(name: str) -> Path:
+    return _project_dir_by_name(sanitize_project(name))
+
+
 def layout_path(name: str) -> Path:
-    return project_dir(name) / "layout.json"
+    return _layout_path_by_name(sanitize_project(name))
 
 
 def media_dir(name: str) -> Path:
-    folder = project_dir(name) / "media"
-    folder.mkdir(parents=True, exist_ok=True)
+    return _media_dir_by_name(sanitize_project(name))
+
+
+# The *_by_name variants take an already-sanitized project name so routes sanitize once per request.
+def _project_dir_by_name(project: str) -> Path:
+    folder = _ensure_dir(PROJECTS_ROOT / project)
+    if _PROJECT_NAMES and project not in _PROJECT_NAMES:
+        with _PROJECT_NAMES_LOCK:
+            _PROJECT_NAMES.add(project)
     return folder
 
 
+def _layout_path_by_name(project: str) -> Path:
+    return _project_dir_by_name(project) / "layout.json"
+
+
+def _media_dir_by_name(project: str) -> Path:
+    return _ensure_dir(_project_dir_by_name(project) / "media")
+
+
 def deep_merge(target: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
     for key, value in updates.items():
         if isinstance(value, dict) and isinstance(target.get(key), dict):
@@ -78,36 +157,36 @@ def deep_merge(target: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any
     return target
 
 
+_NORMALIZED_BLOCK_KEYS = frozenset({"id", "type", "content", "position"})
+
+
 def normalize_block(block: Dict[str, Any]) -> Dict[str, Any]:
     result = {
         "id": block.get("id") or _generate_block_id(),
         "type": block.get("type") or "text",
         "content": block.get("content") or "",
-        "position": {
-            "left": int(_coerce_number(block.get("position", {}).get("left"), 0)),
-            "top": int(_coerce_number(block.get("position", {}).get("top"), 0)),
-            "width": int(_coerce_number(block.get("position", {}).get("width"), 240)),
-            "height": int(_coerce_number(block.get("position", {}).get("height"), 120)),
-        },
+        "position": _normalize_position(block.get("position") or {}),
     }
+    # Styling keys (backgroundColor, textColor, borderRadius, imageUrl, ...) pass through untouched.
+    for key, value in block.items():
+        if key not in _NORMALIZED_BLOCK_KEYS:
+            result[key] = value
+    return result
 
-    if "backgroundColor" in block:
-        result["backgroundColor"] = block["backgroundColor"]
-    if "textColor" in block:
-        result["textColor"] = block["textColor"]
-    if "borderRadius" in block:
-        result["borderRadius"] = block["borderRadius"]
-    if "imageUrl" in block:
-        result["imageUrl"] = block["imageUrl"]
-
-    extra_keys = set(block.keys()) - {"id", "type", "content", "position", "backgroundColor", "textColor", "borderRadius", "imageUrl"}
-    for key in extra_keys:
-        result[key] = block[key]
 
-    return result
+def _normalize_position(position: Dict[str, Any]) -> Dict[str, int]:
+    return {
+        "left": int(_coerce_number(position.get("left"), 0)),
+        "top": int(_coerce_number(position.get("top"), 0)),
+        "width": int(_coerce_number(position.get("width"), 240)),
+        "height": int(_coerce_number(position.get("height"), 120)),
+    }
 
 
 def _coerce_number(value: Any, fallback: float) -> float:
+    kind = type(value)
+    if kind is int or kind is float:
+        return value
     try:
         if value is None or (isinstance(value, str) and value.strip() == ""):
             return fallback
@@ -116,8 +195,17 @@ def _coerce_number(value: Any, fallback: float) -> float:
         return fallback
 
 
+def _fresh_default_layout() -> Dict[str, Any]:
+    # DEFAULT_LAYOUT is only two levels deep, so copy its containers by hand instead of deepcopy.
+    layout = dict(DEFAULT_LAYOUT)
+    layout["dimensions"] = dict(DEFAULT_LAYOUT["dimensions"])
+    layout["blocks"] = []
+    layout["layers"] = [dict(layer) for layer in DEFAULT_LAYOUT["layers"]]
+    return layout
+
+
 def normalize_layout(data: Dict[str, Any], project_name: str) -> Dict[str, Any]:
-    layout = deepcopy(DEFAULT_LAYOUT)
+    layout = _fresh_default_layout()
     layout.update({k: v for k, v in data.items() if k != "blocks"})
     layout["project"] = project_name
 
@@ -127,27 +215,96 @@ def normalize_layout(data: Dict[str, Any], project_name: str) -> Dict[str, Any]:
 
 
 def load_layout(project: str) -> Dict[str, Any]:
-    path = layout_path(project)
-    if not path.exists():
-        return normalize_layout({"blocks": []}, sanitize_project(project))
+    return _load_layout_by_name(sanitize_project(project))
+
+
+def save_layout(project: str, layout: Dict[str, Any]) -> Dict[str, Any]:
+    return _save_layout_by_name(sanitize_project(project), layout)
+
+
+def _load_layout_by_name(project: str) -> Dict[str, Any]:
+    path = _layout_path_by_name(project)
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        stat = path.stat()
+    except FileNotFoundError:
+        return normalize_layout({"blocks": []}, project)
+    entry = _fresh_cache_entry(path, stat)
+    if entry is not None:
+        return deepcopy(entry[3])
+    raw = path.read_bytes()
+    try:
+        payload = _decode_json(raw)
     except json.JSONDecodeError:
         payload = {"blocks": []}
-    return normalize_layout(payload, sanitize_project(project))
+    layout = normalize_layout(payload, project)
+    _remember_layout(path, stat, _layout_digest(raw), layout)
+    return layout
 
 
-def save_layout(project: str, layout: Dict[str, Any]) -> Dict[str, Any]:
-    normalized = normalize_layout(layout, sanitize_project(project))
-    path = layout_path(project)
-    path.write_text(json.dumps(normalized, indent=2, ensure_ascii=False), encoding="utf-8")
+def _save_layout_by_name(project: str, layout: Dict[str, Any]) -> Dict[str, Any]:
+    normalized = normalize_layout(layout, project)
+    path = _layout_path_by_name(project)
+    blob = _encode_layout_json(normalized)
+    digest = _layout_digest(blob)
+    try:
+        entry = _fresh_cache_entry(path, path.stat())
+    except FileNotFoundError:
+        entry = None
+    if entry is not None and entry[2] == digest:
+        # Byte-identical to what is already on disk; skip the write.
+        return normalized
+    _atomic_write_bytes(path, blob)
+    _remember_layout(path, path.stat(), digest, normalized)
     return normalized
 
 
-def locate_block(blocks: Iterable[Dict[str, Any]], block_id: str) -> Optional[Dict[str, Any]]:
-    for block in blocks:
+def _atomic_write_bytes(path: Path, blob: bytes) -> None:
+    # Write a sibling temp file and rename over the target so readers never see a partial layout.
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp_path, "wb") as handle:
+            handle.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _layout_digest(blob: bytes) -> bytes:
+    return hashlib.blake2b(blob, digest_size=16).digest()
+
+
+def _fresh_cache_entry(path: Path, stat: os.stat_result) -> Optional[Tuple[int, int, bytes, Dict[str, Any]]]:
+    with _LAYOUT_CACHE_LOCK:
+        entry = _LAYOUT_CACHE.get(path)
+    if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+        return entry
+    return None
+
+
+def _remember_layout(path: Path, stat: os.stat_result, digest: bytes, layout: Dict[str, Any]) -> None:
+    # Cached copies are private: load_layout hands out deep copies so callers can mutate freely.
+    entry = (stat.st_mtime_ns, stat.st_size, digest, deepcopy(layout))
+    with _LAYOUT_CACHE_LOCK:
+        _LAYOUT_CACHE[path] = entry
+
+
+def _decode_json(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _encode_layout_json(layout: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(layout, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(layout, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def locate_block_index(blocks: List[Dict[str, Any]], block_id: str) -> Optional[int]:
+    for index, block in enumerate(blocks):
         if block.get("id") == block_id:
-            return block
+            return index
     return None
 
 
@@ -156,13 +313,7 @@ def _generate_block_id() -> str:
 
 
 def _sanitize_block_after_update(block: Dict[str, Any]) -> None:
-    position = block.get("position") or {}
-    block["position"] = {
-        "left": int(_coerce_number(position.get("left"), 0)),
-        "top": int(_coerce_number(position.get("top"), 0)),
-        "width": int(_coerce_number(position.get("width"), 240)),
-        "height": int(_coerce_number(position.get("height"), 120)),
-    }
+    block["position"] = _normalize_position(block.get("position") or {})
 
 
 # ---------------------------------------------------------------------------
@@ -175,8 +326,18 @@ def index() -> str:
 
 @app.route("/api/projects", methods=["GET"])
 def list_projects():
+    global _PROJECT_NAMES_STAMP
+    now = time.monotonic()
+    with _PROJECT_NAMES_LOCK:
+        if _PROJECT_NAMES and now - _PROJECT_NAMES_STAMP < PROJECT_LIST_TTL:
+            return jsonify({"projects": sorted(_PROJECT_NAMES)})
     projects = {DEFAULT_PROJECT}
-    projects.update({p.name for p in PROJECTS_ROOT.iterdir() if p.is_dir()})
+    with os.scandir(PROJECTS_ROOT) as entries:
+        projects.update(entry.name for entry in entries if entry.is_dir())
+    with _PROJECT_NAMES_LOCK:
+        _PROJECT_NAMES.clear()
+        _PROJECT_NAMES.update(projects)
+        _PROJECT_NAMES_STAMP = now
     return jsonify({"projects": sorted(projects)})
 
 
@@ -184,7 +345,7 @@ def list_projects():
 def layout_api():
     if request.method == "GET":
         project = sanitize_project(request.args.get("project") or DEFAULT_PROJECT)
-        layout = load_layout(project)
+        layout = _load_layout_by_name(project)
         return jsonify(layout)
 
     payload = request.get_json(silent=True) or {}
@@ -193,7 +354,7 @@ def layout_api():
     if not isinstance(layout_data, dict):
         return jsonify({"success": False, "error": "layout must be an object"}), 400
 
-    save_layout(project, layout_data)
+    _save_layout_by_name(project, layout_data)
     return jsonify({"success": True, "project": project})
 
 
@@ -206,7 +367,7 @@ def block_api():
     if operation not in {"add", "update", "delete"}:
         return jsonify({"success": False, "error": "invalid operation"}), 400
 
-    layout = load_layout(project)
+    layout = _load_layout_by_name(project)
     blocks = layout.setdefault("blocks", [])
 
     if operation == "add":
@@ -215,32 +376,34 @@ def block_api():
             return jsonify({"success": False, "error": "block must be an object"}), 400
 
         new_block = normalize_block(block_data)
-        while locate_block(blocks, new_block["id"]):
+        existing_ids = {b.get("id") for b in blocks}
+        while new_block["id"] in existing_ids:
             new_block["id"] = _generate_block_id()
         blocks.append(new_block)
-        save_layout(project, layout)
+        _save_layout_by_name(project, layout)
         return jsonify({"success": True, "block": new_block})
 
     block_id = payload.get("block_id")
     if not isinstance(block_id, str) or not block_id.strip():
         return jsonify({"success": False, "error": "block_id is required"}), 400
 
-    block = locate_block(blocks, block_id)
-    if not block:
+    index = locate_block_index(blocks, block_id)
+    if index is None:
         return jsonify({"success": False, "error": "block not found"}), 404
 
     if operation == "delete":
-        layout["blocks"] = [b for b in blocks if b.get("id") != block_id]
-        save_layout(project, layout)
+        del blocks[index]
+        _save_layout_by_name(project, layout)
         return jsonify({"success": True})
 
     updates = payload.get("updates")
     if not isinstance(updates, dict):
         return jsonify({"success": False, "error": "updates must be an object"}), 400
 
+    block = blocks[index]
     deep_merge(block, updates)
     _sanitize_block_after_update(block)
-    save_layout(project, layout)
+    _save_layout_by_name(project, layout)
     return jsonify({"success": True, "block": block})
 
 
@@ -258,8 +421,9 @@ def upload_media():
     ext = Path(safe_name).suffix or ".bin"
     unique_name = f"{Path(safe_name).stem}-{uuid4().hex[:10]}{ext}"
 
-    target_path = media_dir(project) / unique_name
-    file.save(target_path)
+    target_path = _media_dir_by_name(project) / unique_name
+    with open(target_path, "wb", buffering=0) as destination:
+        shutil.copyfileobj(file.stream, destination, UPLOAD_COPY_BUFFER)
 
     url = url_for(ASSET_ROUTE, project=project, filename=unique_name)
     return jsonify({"success": True, "url": url, "filename": unique_name})
@@ -273,7 +437,7 @@ def run_agent():
     snapshot_data = payload.get("snapshot")
     model = str(payload.get("model") or DEFAULT_MODEL).strip() or DEFAULT_MODEL
 
-    layout = load_layout(project)
+    layout = _load_layout_by_name(project)
     session = LayoutSession(layout, project=project)
 
     if not snapshot_data:
@@ -306,7 +470,7 @@ def run_agent():
     updated_layout = session.layout
     modified = session.modified
     if modified:
-        updated_layout = save_layout(project, session.layout)
+        updated_layout = _save_layout_by_name(project, session.layout)
 
     events = [event.to_dict() for event in session.events]
 
@@ -327,8 +491,18 @@ def run_agent():
 @app.route("/project-assets/<project>/<path:filename>")
 def serve_project_asset(project: str, filename: str):
     project_name = sanitize_project(project)
-    directory = media_dir(project_name)
-    return send_from_directory(directory, filename)
+    directory = _media_dir_by_name(project_name)
+    if ASSET_ACCEL_PREFIX:
+        if safe_join(str(directory), filename) is None:
+            abort(404)
+        # nginx keeps these headers on the internal redirect, so match what send_from_directory would send.
+        response = app.response_class(mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream")
+        response.cache_control.public = True
+        response.cache_control.max_age = ASSET_MAX_AGE
+        # The internal location maps onto PROJECTS_ROOT, so the path goes through the project's media folder.
+        response.headers["X-Accel-Redirect"] = f"{ASSET_ACCEL_PREFIX}/{quote(project_name, safe='')}/media/{quote(filename)}"
+        return response
+    return send_from_directory(directory, filename, conditional=True, max_age=ASSET_MAX_AGE)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,16 @@
 # core.py
 import json
-import base64
 import os
-import tempfile
+import sys
 from typing import Any, Callable, Dict, List, Optional
 
 from openai import OpenAI
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 # Initialize the OpenAI-compatible client for DashScope
 DASHSCOPE_API_KEY = os.getenv("DASHSCOPE_API_KEY") or "sk-1980181c4a2540a9bb234a989b641bc1"
 DASHSCOPE_BASE_URL = os.getenv("DASHSCOPE_BASE_URL") or "https://dashscope.aliyuncs.com/compatible-mode/v1"
@@ -17,27 +21,46 @@ client = OpenAI(
     base_url=DASHSCOPE_BASE_URL,
 )
 
-def save_snapshot_image(snapshot_b64: str) -> str:
-    """
-    Decode base64 snapshot data and save it as a temporary PNG file.
-    Returns a file path accessible to the chat API.
-    """
-    if not snapshot_b64:
-        return None
-    try:
-        # Strip off data URL prefix if present
-        if snapshot_b64.startswith("data:image"):
-            header, data = snapshot_b64.split(",", 1)
-        else:
-            data = snapshot_b64
-        binary = base64.b64decode(data)
-        tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        tmp_file.write(binary)
-        tmp_file.close()
-        return tmp_file.name
-    except Exception as e:
-        print(f"[core.py] Snapshot decode failed: {e}")
-        return None
+# Echo streamed model output to stdout (handy in development); off by default so servers skip the writes.
+STREAM_ECHO = os.getenv("FIONA_VERBOSE", "").strip().lower() in {"1", "true", "yes", "on"}
+STREAM_ECHO_BATCH = 64
+
+
+class _StreamEcho:
+    """Collects streamed tokens and writes them to stdout in batches instead of flushing per token."""
+
+    def __init__(self, enabled: bool, batch_size: int = STREAM_ECHO_BATCH) -> None:
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self._pending: List[str] = []
+
+    def write(self, text: str) -> None:
+        if not self.enabled:
+            return
+        self._pending.append(text)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            sys.stdout.write("".join(self._pending))
+            sys.stdout.flush()
+            self._pending.clear()
+
+
+def _loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _dumps(payload: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(payload, ensure_ascii=False)
 
 
 def ollama_chat(
@@ -55,34 +78,34 @@ def ollama_chat(
     Returns dict with reasoning + answer text.
     """
     image_url_block = None
-    local_image_path = None
     normalized_snapshot_url = None
 
-    # If a snapshot is provided, decode and save temporarily
+    # The model receives the snapshot inline as a data URL; no temp file is needed.
     if snapshot_b64:
-        local_image_path = save_snapshot_image(snapshot_b64)
-        if snapshot_b64:
-            normalized_snapshot_url = snapshot_b64.strip()
-            if not normalized_snapshot_url.startswith("data:image"):
-                normalized_snapshot_url = f"data:image/png;base64,{normalized_snapshot_url}"
-            image_url_block = {
-                "type": "image_url",
-                "image_url": {"url": normalized_snapshot_url}
-            }
+        normalized_snapshot_url = snapshot_b64.strip()
+        if not normalized_snapshot_url.startswith("data:image"):
+            normalized_snapshot_url = f"data:image/png;base64,{normalized_snapshot_url}"
+        image_url_block = {
+            "type": "image_url",
+            "image_url": {"url": normalized_snapshot_url}
+        }
 
 
     # Build messages for the chat API
+    # The snapshot shows the current canvas, so it only rides along with the latest user turn.
+    image_index = None
+    if image_url_block:
+        for index, msg in enumerate(messages):
+            if msg.get("role", "user") == "user":
+                image_index = index
     formatted_messages = []
-    for msg in messages:
+    for index, msg in enumerate(messages):
         role = msg.get("role", "user")
-        content = []
-        if image_url_block and role == "user":
-            content.append(image_url_block)
-        if isinstance(msg.get("content"), list):
-            content.extend(msg["content"])
-        else:
-            content.append({"type": "text", "text": str(msg.get("content", ""))})
-        formatted_messages.append({"role": role, "content": content})
+        content = msg.get("content", "")
+        parts = content if isinstance(content, list) else [{"type": "text", "text": str(content)}]
+        if index == image_index:
+            parts = [image_url_block, *parts]
+        formatted_messages.append({"role": role, "content": parts})
 
     executed_tool_calls: List[Dict[str, Any]] = []
     reasoning_accumulator: List[str] = []
@@ -134,7 +157,7 @@ def ollama_chat(
                 for tool_call in message.tool_calls:
                     args_payload: Dict[str, Any]
                     try:
-                        args_payload = json.loads(tool_call.function.arguments or "{}")
+                        args_payload = _loads(tool_call.function.arguments or "{}")
                     except json.JSONDecodeError:
                         args_payload = {"__raw": tool_call.function.arguments or "", "error": "invalid json"}
                     result_payload: Dict[str, Any]
@@ -158,7 +181,7 @@ def ollama_chat(
                             "role": "tool",
                             "tool_call_id": tool_call.id,
                             "name": tool_call.function.name,
-                            "content": json.dumps(result_payload, ensure_ascii=False),
+                            "content": _dumps(result_payload),
                         }
                     )
                 continue
@@ -178,28 +201,32 @@ def ollama_chat(
             }
         )
 
-        print("\n" + "=" * 15 + " MODEL STREAM " + "=" * 15 + "\n")
+        echo = _StreamEcho(STREAM_ECHO)
+        echo.write("\n" + "=" * 15 + " MODEL STREAM " + "=" * 15 + "\n\n")
         is_answering = False
+        answer_parts: List[str] = []
         for chunk in completion:
             if not chunk.choices:
                 if hasattr(chunk, "usage"):
-                    print("\nUsage stats:", chunk.usage)
+                    echo.write(f"\nUsage stats: {chunk.usage}\n")
                 continue
             delta = chunk.choices[0].delta
             if getattr(delta, "reasoning_content", None):
-                print(delta.reasoning_content, end="", flush=True)
+                echo.write(delta.reasoning_content)
                 reasoning_accumulator.append(delta.reasoning_content)
             else:
                 if not is_answering and delta.content != "":
-                    print("\n" + "=" * 20 + " Reply " + "=" * 20 + "\n")
+                    echo.write("\n" + "=" * 20 + " Reply " + "=" * 20 + "\n\n")
                     is_answering = True
-                print(delta.content, end="", flush=True)
-                answer += delta.content
+                echo.write(str(delta.content))
+                answer_parts.append(delta.content)
 
-        print("\n" + "=" * 48 + "\n")
+        echo.write("\n" + "=" * 48 + "\n\n")
+        echo.flush()
+        answer = "".join(answer_parts)
 
     answer_text = answer.strip()
-    reasoning_text = "\n".join(chunk.strip() for chunk in reasoning_accumulator if chunk.strip())
+    reasoning_text = "\n".join(stripped for chunk in reasoning_accumulator if (stripped := chunk.strip()))
     message_payload = {
         "role": "assistant",
         "content": [],
@@ -11,16 +11,22 @@ editing layout JSON.
 from __future__ import annotations
 
 import argparse
+import base64
+import io
 import json
 import re
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from snapshot import (
     DEFAULT_PROJECT,
     DEFAULT_SNAPSHOT_SIZE,
     STATE_ROOT,
-    encode_image,
     load_layout,
     render_snapshot,
 )
@@ -70,8 +76,15 @@ def resolve_layout_path(args: argparse.Namespace) -> Path:
     return project_dir / "layout.json"
 
 
+_SIZE_RE = re.compile(r"^\s*(\d+)\s*[xX]\s*(\d+)\s*$", flags=re.ASCII)
+
+
 def parse_size(raw: str) -> Tuple[int, int]:
-    match = re.match(r"^\s*(\d+)\s*[xX]\s*(\d+)\s*$", raw or "")
+    width, separator, height = (raw or "").lower().partition("x")
+    width, height = width.strip(), height.strip()
+    if separator and width.isascii() and width.isdigit() and height.isascii() and height.isdigit():
+        return max(100, int(width)), max(100, int(height))
+    match = _SIZE_RE.match(raw or "")
     if not match:
         return DEFAULT_SNAPSHOT_SIZE
     return max(100, int(match.group(1))), max(100, int(match.group(2)))
@@ -84,20 +97,29 @@ def main() -> None:
     layout = load_layout(layout_path)
     image = render_snapshot(layout, size)
 
+    # Encode once and reuse the bytes for both the file and the base64 payload.
+    # Previews are read by the agent, so a fast low compression level is fine.
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=False, compress_level=1)
+    data = buffer.getbuffer()
+
     result: Dict[str, Any] = {}
     if args.output:
         args.output.parent.mkdir(parents=True, exist_ok=True)
-        image.save(args.output, format="PNG")
+        args.output.write_bytes(data)
         result["path"] = str(args.output)
 
     if not args.no_base64:
-        result["base64"] = encode_image(image)
+        result["base64"] = base64.b64encode(data).decode("ascii")
 
     if args.json or result.get("path") or result.get("base64") is not None:
-        print(json.dumps(result))
+        if orjson is not None:
+            print(orjson.dumps(result).decode("utf-8"))
+        else:
+            print(json.dumps(result))
     else:
         # Fallback: print base64 directly for convenience
-        print(encode_image(image))
+        print(base64.b64encode(data).decode("ascii"))
 
 
 if __name__ == "__main__":
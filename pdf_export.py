@@ -8,9 +8,9 @@ The export is designed to be lossless and exactly 1:1 with the canvas' shown con
 """
 
 from __future__ import annotations
-import base64, io, math, re
+import base64, functools, hashlib, io, json, math, operator, os, re, threading, time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
 from html import unescape
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
@@ -35,6 +35,24 @@ DEFAULT_PAGE_HEIGHT = 1123.0
 CANVAS_PADDING = 48.0  # This matches the padding in the CSS (.block-layer padding)
 DEFAULT_FONT = "Helvetica"
 DEFAULT_FONT_BOLD = "Helvetica-Bold"
+# Worker processes for multi-page exports; 1 keeps rendering in-process.
+PDF_EXPORT_WORKERS = max(1, int(os.getenv("FIONA_PDF_WORKERS", "1") or 1))
+
+_IMAGE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".webp", ".svg", ".gif", ".bmp", ".tiff"})
+
+_RGBA_RE = re.compile(r"rgba?\(([^)]+)\)")
+_GRAD_RE = re.compile(r"linear-gradient\(([^,]+)deg\s*,\s*(.+)\)")
+_TAG_RE = re.compile(r"<[^>]*>")
+_HEX2 = {f"{i:02x}": i / 255.0 for i in range(256)}
+_BYTE_UNIT = tuple(i / 255.0 for i in range(256))
+# Shorter text is cheaper to draw inline than to wrap in a form XObject.
+_FORM_MIN_TEXT = 200
+# Export directories already created this process; a lost race just repeats an exist_ok mkdir.
+_EXPORT_DIRS_READY: set = set()
+# Parsed paragraphs are reused per thread; wrap() state makes them unsafe to share.
+_PARAGRAPH_POOL = threading.local()
+_PARAGRAPH_POOL_SIZE = 512
+_FORM_PLACEMENT_KEYS = frozenset({"id", "position", "zIndex", "compositeZ", "rotation"})
 
 class PdfExportError(RuntimeError):
     pass
@@ -51,6 +69,12 @@ def _require_reportlab():
         raise PdfExportError("ReportLab is required for PDF export.") from REPORTLAB_IMPORT_ERROR
 
 def _coerce_float(value: Any, fallback: float) -> float:
+    # JSON numbers arrive as plain float/int; skip the try/except for them.
+    value_type = type(value)
+    if value_type is float:
+        return value if math.isfinite(value) else fallback
+    if value_type is int:
+        return float(value)
     try:
         number = float(value)
         if math.isnan(number) or math.isinf(number):
@@ -62,25 +86,33 @@ def _coerce_float(value: Any, fallback: float) -> float:
 def _sanitize_text(content: Any) -> str:
     if content is None:
         return ""
-    text = str(content)
-    text = unescape(text)
-    text = text.replace("\r", "").replace("\n", "<br/>")
+    text = content if isinstance(content, str) else str(content)
+    # Only entity-bearing text needs the html parser; plain strings skip it.
+    if "&" in text:
+        text = unescape(text)
+    if "\r" in text:
+        text = text.replace("\r", "")
+    if "\n" in text:
+        text = text.replace("\n", "<br/>")
     return text.strip()
 
-def _parse_color(value: Any, fallback: Optional[Color] = None) -> Optional[Color]:
-    if not isinstance(value, str):
-        return fallback
+@functools.lru_cache(maxsize=1024)
+def _parse_color_string(value: str) -> Optional[Color]:
     value = value.strip()
     if value.startswith("#"):
-        hexv = value[1:]
+        hexv = value[1:].lower()
         if len(hexv) == 3:
             hexv = "".join(c*2 for c in hexv)
+        try:
+            return Color(_HEX2[hexv[0:2]], _HEX2[hexv[2:4]], _HEX2[hexv[4:6]])
+        except KeyError:
+            pass
         try:
             r, g, b = (int(hexv[i:i+2], 16) / 255.0 for i in (0, 2, 4))
             return Color(r, g, b)
         except Exception:
-            return fallback
-    match = re.match(r"rgba?\(([^)]+)\)", value)
+            return None
+    match = _RGBA_RE.match(value)
     if match:
         parts = [p.strip() for p in match.group(1).split(",")]
         if len(parts) >= 3:
@@ -89,47 +121,116 @@ def _parse_color(value: Any, fallback: Optional[Color] = None) -> Optional[Color
                 return Color(r, g, b)
             except Exception:
                 pass
-    return fallback
+    return None
+
+def _parse_color(value: Any, fallback: Optional[Color] = None) -> Optional[Color]:
+    if not isinstance(value, str):
+        return fallback
+    color = _parse_color_string(value)
+    return fallback if color is None else color
 
 def _decode_data_uri(source: str) -> Optional[io.BytesIO]:
     if source.startswith("data:image/"):
         try:
             header, data = source.split(",", 1)
             if ";base64" in header:
-                return io.BytesIO(base64.b64decode(data))
+                return io.BytesIO(base64.b64decode(data, validate=False))
         except Exception:
             return None
     return None
 
-def _resolve_image_reader(block: Dict[str, Any], asset_base: Optional[Path]) -> Optional[ImageReader]:
+def _remember_reader(cache: Optional[Dict[str, Optional[ImageReader]]], key: str, source: Any) -> Optional[ImageReader]:
+    try:
+        reader = ImageReader(source)
+    except Exception:
+        reader = None
+    if cache is not None:
+        cache[key] = reader
+    return reader
+
+def _resolve_image_reader(
+    block: Dict[str, Any],
+    asset_base: Optional[Path],
+    cache: Optional[Dict[str, Optional[ImageReader]]] = None,
+    asset_files: Optional[Dict[str, Path]] = None,
+) -> Optional[ImageReader]:
+    # Readers are cached per export so repeated images are decoded once and share one XObject.
     content = block.get("content")
     if isinstance(content, str):
         # handle data URIs
-        data_uri = _decode_data_uri(content)
-        if data_uri:
-            try:
-                return ImageReader(data_uri)
-            except Exception:
-                return None
-        # handle http/file sources with image extension only
-        if content.startswith(("http://", "https://", "file://")):
-            suffix = Path(content.split("?")[0]).suffix.lower()
-            if suffix in {".png", ".jpg", ".jpeg", ".webp", ".svg", ".gif", ".bmp", ".tiff"}:
-                try:
-                    return ImageReader(content.replace("file://", ""))
-                except Exception:
-                    pass
+        if cache is not None and content in cache:
+            reader = cache[content]
+            if reader or content.startswith("data:image/"):
+                return reader
+        else:
+            data_uri = _decode_data_uri(content)
+            if data_uri:
+                return _remember_reader(cache, content, data_uri)
+            # handle http/file sources with image extension only
+            if content.startswith(("http://", "https://", "file://")):
+                suffix = Path(content.split("?")[0]).suffix.lower()
+                if suffix in _IMAGE_SUFFIXES:
+                    reader = _remember_reader(cache, content, content.replace("file://", ""))
+                    if reader:
+                        return reader
     # handle local raw paths with validation
     raw = block.get("rawPath")
     if raw and asset_base:
-        candidate = asset_base / raw
-        if candidate.exists() and candidate.suffix.lower() in {".png", ".jpg", ".jpeg", ".webp", ".svg", ".gif", ".bmp", ".tiff"}:
-            try:
-                return ImageReader(str(candidate))
-            except Exception:
-                pass
+        if asset_files is not None:
+            # Look the path up in the export's one-off scan instead of stat()ing it.
+            candidate = asset_files.get(Path(os.path.normpath(raw)).as_posix())
+            if candidate is None:
+                return None
+        else:
+            candidate = asset_base / raw
+        key = str(candidate)
+        if cache is not None and key in cache:
+            return cache[key]
+        if (asset_files is not None or candidate.exists()) and candidate.suffix.lower() in _IMAGE_SUFFIXES:
+            reader = _remember_reader(cache, key, key)
+            if reader:
+                return reader
     return None
 
+def _scan_asset_files(asset_root: Path) -> Dict[str, Path]:
+    """Index image files under the asset root by their relative POSIX path."""
+    return {
+        p.relative_to(asset_root).as_posix(): p
+        for p in asset_root.rglob("*")
+        if p.suffix.lower() in _IMAGE_SUFFIXES
+    }
+
+def _uses_raw_paths(pages: List[Dict[str, Any]]) -> bool:
+    return any(
+        isinstance(blk, dict) and blk.get("rawPath")
+        for page in pages
+        for blk in page.get("blocks", []) or []
+    )
+
+def _prefetch_images(
+    pages: List[Dict[str, Any]],
+    asset_root: Optional[Path],
+    cache: Dict[str, Optional[ImageReader]],
+    asset_files: Optional[Dict[str, Path]] = None,
+):
+    """Resolve and open every distinct image source up front, in parallel."""
+    candidates: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+    for page in pages:
+        for blk in page.get("blocks", []) or []:
+            if not isinstance(blk, dict):
+                continue
+            content = blk.get("content")
+            is_source = isinstance(content, str) and content.startswith(("data:image/", "http://", "https://", "file://"))
+            if is_source or blk.get("rawPath"):
+                candidates.setdefault((content if is_source else None, blk.get("rawPath")), blk)
+    if len(candidates) < 2:
+        return
+    # Remote fetches and file reads mostly run outside the GIL. Pixels are left to
+    # drawImage, which embeds JPEGs directly without decoding them.
+    workers = min(len(candidates), (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda blk: _resolve_image_reader(blk, asset_root, cache, asset_files), candidates.values()))
+
 def _resolve_rect(pos: Dict[str, Any], ph: float) -> Optional[Rect]:
     if not isinstance(pos, dict):
         return None
@@ -154,42 +255,80 @@ def _resolve_font(block: Dict[str, Any], typ: Dict[str, Any]) -> str:
     t = str(block.get("type", "")).lower()
     return DEFAULT_FONT_BOLD if t in {"headline", "title", "pullquote"} else DEFAULT_FONT
 
-def _parse_gradient(bg: str, rect: Rect) -> Optional[list]:
-    m = re.match(r"linear-gradient\(([^,]+)deg\s*,\s*(.+)\)", bg)
+@functools.lru_cache(maxsize=256)
+def _parse_gradient(bg: str) -> Optional[Tuple[float, Tuple[Color, ...], Tuple[float, ...]]]:
+    # Gradient strings repeat across blocks, so stops and their offsets are worked out once.
+    m = _GRAD_RE.match(bg)
     if not m:
         return None
     angle = float(m.group(1))
     colors = [c.strip() for c in m.group(2).split(",")]
-    stops = []
-    for i, c in enumerate(colors):
-        col = _parse_color(c, None)
-        if col:
-            t = i / max(len(colors)-1, 1)
-            dx = rect.width * math.cos(math.radians(angle)) * t
-            dy = rect.height * math.sin(math.radians(angle)) * t
-            stops.append((col, dx, dy))
-    return stops
-
-def _draw_text_block(pdf: canvas.Canvas, block: Dict[str, Any], rect: Rect, typ: Dict[str, Any]):
-    text = _sanitize_text(block.get("content"))
-    if not text:
+    stops = tuple(col for col in (_parse_color(c, None) for c in colors) if col)
+    if not stops:
+        return None
+    last = max(len(stops) - 1, 1)
+    return angle, stops, tuple(i / last for i in range(len(stops)))
+
+def _pack_color(r: float, g: float, b: float, a: float = 1.0) -> int:
+    """Quantize an RGBA colour in [0, 1] to a packed 0xAARRGGBB integer."""
+    def q(v: float) -> int:
+        return 0 if v <= 0 else 255 if v >= 1 else int(v * 255 + 0.5)
+    return (q(a) << 24) | (q(r) << 16) | (q(g) << 8) | q(b)
+
+@functools.lru_cache(maxsize=1024)
+def _unpack_color(packed: int) -> Color:
+    return Color(
+        _BYTE_UNIT[(packed >> 16) & 0xFF],
+        _BYTE_UNIT[(packed >> 8) & 0xFF],
+        _BYTE_UNIT[packed & 0xFF],
+        _BYTE_UNIT[(packed >> 24) & 0xFF],
+    )
+
+def _set_fill(pdf: canvas.Canvas, color: Color, alpha: float = 1.0):
+    # Skip the colour/alpha operators when the block already has this fill.
+    # setFillColor also resets alpha to the colour's own, so pass the block's explicitly.
+    packed = _pack_color(color.red, color.green, color.blue, alpha)
+    if getattr(pdf, "_fiona_fill", None) == packed:
         return
-    fs = _coerce_float(typ.get("fontSize"), 18)
-    lh = typ.get("lineHeight", 1.4)
-    # Calculate line height in points
-    lead = fs * (lh if lh > 1 else 1.4)
-    align = {"center": TA_CENTER, "right": TA_RIGHT, "justify": TA_JUSTIFY}.get(str(typ.get("textAlign", "left")).lower(), TA_LEFT)
-    color = _parse_color(typ.get("textColor"), Color(0, 0, 0))
-    if typ.get("uppercase"):
-        text = text.upper()
+    pdf.setFillColor(color, alpha=alpha)
+    pdf._fiona_fill = packed
+
+def _reset_fill(pdf: canvas.Canvas):
+    pdf._fiona_fill = None
+
+def _draw_gradient(pdf: canvas.Canvas, grad: Tuple[float, Tuple[Color, ...], Tuple[float, ...]], width: float, height: float, alpha: float = 1.0):
+    angle, stops, positions = grad
+    if len(stops) == 1:
+        _set_fill(pdf, stops[0], alpha)
+        pdf.rect(0, 0, width, height, fill=1, stroke=0)
+        return
+    # CSS angles run clockwise from "to top"; the gradient line spans the box corners.
+    rad = math.radians(angle)
+    dx, dy = math.sin(rad), math.cos(rad)
+    half = (abs(width * dx) + abs(height * dy)) / 2
+    cx, cy = width / 2, height / 2
+    pdf.saveState()
+    clip = pdf.beginPath()
+    clip.rect(0, 0, width, height)
+    pdf.clipPath(clip, stroke=0, fill=0)
+    pdf.linearGradient(
+        cx - dx * half, cy - dy * half, cx + dx * half, cy + dy * half,
+        list(stops),
+        positions=list(positions),
+        extend=True,
+    )
+    pdf.restoreState()
+
+@functools.lru_cache(maxsize=512)
+def _get_paragraph_style(font: str, fs: float, lead: float, align: int, color: int) -> ParagraphStyle:
     # Create paragraph style with exact font sizes for lossless rendering
-    style = ParagraphStyle(
+    return ParagraphStyle(
         "sty",
-        fontName=_resolve_font(block, typ),
+        fontName=font,
         fontSize=fs,
         leading=lead,
         alignment=align,
-        textColor=color,
+        textColor=_unpack_color(color),
         # Ensure exact rendering with no extra padding
         leftIndent=0,
         rightIndent=0,
@@ -198,95 +337,224 @@ def _draw_text_block(pdf: canvas.Canvas, block: Dict[str, Any], rect: Rect, typ:
         bulletFontSize=0,
         wordWrap=None
     )
-    p = Paragraph(text, style)
+
+def _get_paragraph(text: str, style: ParagraphStyle) -> Paragraph:
+    pool = getattr(_PARAGRAPH_POOL, "paragraphs", None)
+    if pool is None:
+        pool = _PARAGRAPH_POOL.paragraphs = {}
+    key = (text, style)
+    p = pool.get(key)
+    if p is None:
+        if len(pool) >= _PARAGRAPH_POOL_SIZE:
+            pool.clear()
+        p = pool[key] = Paragraph(text, style)
+    return p
+
+def _draw_plain_line(pdf: canvas.Canvas, text: str, font: str, fs: float, align: int, color: Color, width: float, height: float, alpha: float = 1.0) -> bool:
+    # Plain single-line text that fits needs no Platypus layout; markup, entities,
+    # collapsible whitespace and wrapping still go through Paragraph.
+    if align == TA_JUSTIFY or len(text) >= 200 or "<" in text or "&" in text or text != " ".join(text.split()):
+        return False
+    try:
+        text_width = pdfmetrics.stringWidth(text, font, fs)
+    except Exception:
+        return False
+    if text_width > width:
+        return False
+    if align == TA_CENTER:
+        x = (width - text_width) / 2
+    elif align == TA_RIGHT:
+        x = width - text_width
+    else:
+        x = 0
+    pdf.setFont(font, fs)
+    _set_fill(pdf, color, alpha)
+    # Paragraph puts the first baseline one font size below the top edge.
+    pdf.drawString(x, height - fs, text)
+    return True
+
+def _usable_font(font: str) -> str:
+    try:
+        pdfmetrics.getFont(font)
+        return font
+    except (KeyError, ValueError):
+        return DEFAULT_FONT
+
+def _wrap_plain_lines(text: str, font: str, fs: float, width: float) -> List[str]:
+    lines: List[str] = []
+    for raw_line in text.split("<br/>"):
+        words = _TAG_RE.sub("", raw_line).split()
+        if not words:
+            lines.append("")
+            continue
+        current = words[0]
+        for word in words[1:]:
+            candidate = f"{current} {word}"
+            if pdfmetrics.stringWidth(candidate, font, fs) <= width:
+                current = candidate
+            else:
+                lines.append(current)
+                current = word
+        lines.append(current)
+    return lines
+
+def _draw_text_block(pdf: canvas.Canvas, block: Dict[str, Any], rect: Rect, typ: Dict[str, Any], alpha: float = 1.0):
+    text = _sanitize_text(block.get("content"))
+    if not text:
+        return
+    fs = _coerce_float(typ.get("fontSize"), 18)
+    lh = typ.get("lineHeight", 1.4)
+    # Calculate line height in points
+    lead = fs * (lh if lh > 1 else 1.4)
+    align = {"center": TA_CENTER, "right": TA_RIGHT, "justify": TA_JUSTIFY}.get(str(typ.get("textAlign", "left")).lower(), TA_LEFT)
+    color = _parse_color(typ.get("textColor"), Color(0, 0, 0))
+    if typ.get("uppercase"):
+        text = text.upper()
+    font = _resolve_font(block, typ)
     # Use the full rectangle dimensions without additional padding for text
     available_width = rect.width
     available_height = rect.height
+    if _draw_plain_line(pdf, text, font, fs, align, color, available_width, available_height, alpha):
+        return
+    # Paragraph sets its own fill colour, so the block opacity rides on the style's colour.
+    style = _get_paragraph_style(font, fs, lead, align, _pack_color(color.red, color.green, color.blue, alpha))
     try:
+        p = _get_paragraph(text, style)
         w, h = p.wrap(available_width, available_height)
         # Draw the paragraph with exact positioning
         # Position at the top of the available space
         p.drawOn(pdf, 0, available_height - h)  # Relative to translated block position
-    except:
-        # Fallback to simpler text rendering if paragraph fails
-        pdf.setFont(_resolve_font(block, typ), fs)
-        pdf.setFillColor(color)
-        lines = text.split('<br/>')[:5]  # Limit to 5 lines to fit
-        y_pos = available_height - fs  # Start from top
-        for line in lines:
+        _reset_fill(pdf)
+    except (ValueError, KeyError):
+        # Paragraph rejects malformed markup and unregistered fonts; draw plain wrapped text instead
+        _reset_fill(pdf)
+        font = _usable_font(font)
+        pdf.setFont(font, fs)
+        _set_fill(pdf, color, alpha)
+        text_obj = pdf.beginText(0, available_height - fs)  # Start from top
+        text_obj.setLeading(lead)
+        y_pos = available_height - fs
+        for line in _wrap_plain_lines(text, font, fs, available_width):
             if y_pos < 0:
                 break  # Stop if we run out of space
-            pdf.drawString(0, y_pos, line[:80])  # Limit line length
+            text_obj.textLine(line)
             y_pos -= lead
+        pdf.drawText(text_obj)
+
+@functools.lru_cache(maxsize=360)
+def _rotation_cos_sin(degrees: float) -> Tuple[float, float]:
+    rad = math.radians(degrees)
+    return math.cos(rad), math.sin(rad)
+
+def _intersects_page(rect: Rect, rotation: float, pw: float, ph: float) -> bool:
+    if rotation:
+        # Rotated blocks are drawn around their centre; the diagonal bounds them at any angle.
+        reach = math.hypot(rect.width, rect.height)
+        cx = rect.x + rect.width / 2
+        cy = rect.y + rect.height / 2
+        return cx + reach > 0 and cx - reach < pw and cy + reach > 0 and cy - reach < ph
+    return rect.x + rect.width > 0 and rect.x < pw and rect.y + rect.height > 0 and rect.y < ph
+
+def _draw_block_content(
+    pdf: canvas.Canvas,
+    block: Dict[str, Any],
+    width: float,
+    height: float,
+    grad: Optional[Tuple[float, Tuple[Color, ...], Tuple[float, ...]]],
+    col: Optional[Color],
+    img: Optional[ImageReader],
+    alpha: float = 1.0,
+):
+    # Draw background - whether solid color, gradient, or image
+    if grad:
+        # One axial shading instead of stacked strips; the viewer interpolates it.
+        _draw_gradient(pdf, grad, width, height, alpha)
+    elif col:
+        _set_fill(pdf, col, alpha)
+        pdf.rect(0, 0, width, height, fill=1, stroke=0)
 
-def _draw_block(pdf: canvas.Canvas, block: Dict[str, Any], ph: float, asset: Optional[Path]):
+    if img:
+        # Draw image with the exact dimensions of the block
+        # Use higher quality image rendering without resampling artifacts
+        pdf.drawImage(img, 0, 0, width, height, 
+                     preserveAspectRatio=True, anchor='c', mask='auto')
+    else:
+        typ = block.get("typography", {}) or {}
+        if isinstance(typ, dict):
+            # Calculate the text area within the block
+            text_rect = Rect(0, 0, width, height)
+            _draw_text_block(pdf, block, text_rect, typ, alpha)
+
+def _draw_block(
+    pdf: canvas.Canvas,
+    block: Dict[str, Any],
+    ph: float,
+    asset: Optional[Path],
+    image_cache: Optional[Dict[str, Optional[ImageReader]]] = None,
+    pw: Optional[float] = None,
+    forms: Optional[Dict[int, str]] = None,
+    asset_files: Optional[Dict[str, Path]] = None,
+):
     rect = _resolve_rect(block.get("position"), ph)
     if not rect:
         return
     rotation = _coerce_float(block.get("rotation"), 0)
-    bg = block.get("background", "")
+    if pw is not None and not _intersects_page(rect, rotation, pw, ph):
+        return
     op = float(block.get("opacity", 1))
-    grad = _parse_gradient(bg, rect) if isinstance(bg, str) and bg.startswith("linear-gradient") else None
-    img = _resolve_image_reader(block, asset)
+    if op <= 0:
+        return
+    # Forms lack ExtGState resources, so translucent blocks are always drawn inline.
+    form_name = forms.get(id(block)) if forms and op >= 1 else None
+    reuse_form = form_name is not None and pdf.hasForm(form_name)
+    if not reuse_form:
+        bg = block.get("background", "")
+        grad = _parse_gradient(bg) if isinstance(bg, str) and bg.startswith("linear-gradient") else None
+        col = None if grad else _parse_color(bg, None)
+        img = _resolve_image_reader(block, asset, image_cache, asset_files)
+        if not (grad or col or img) and block.get("content") in (None, ""):
+            return
 
     pdf.saveState()
     if rotation != 0:
-        # For rotation, translate to center of block, rotate, then translate back
-        center_x = rect.x + rect.width / 2
-        center_y = rect.y + rect.height / 2
-        pdf.translate(center_x, center_y)
-        pdf.rotate(rotation)
-        # Adjust rect coordinates relative to the new origin
-        adjusted_rect = Rect(-rect.width/2, -rect.height/2, rect.width, rect.height)
+        # Rotate about the block centre in one CTM change: translate to the centre,
+        # rotate, then translate back by half the block size.
+        c, s = _rotation_cos_sin(rotation)
+        half_w = rect.width / 2
+        half_h = rect.height / 2
+        pdf.transform(
+            c, s, -s, c,
+            rect.x + half_w - c * half_w + s * half_h,
+            rect.y + half_h - s * half_w - c * half_h,
+        )
     else:
         pdf.translate(rect.x, rect.y)
-        adjusted_rect = Rect(0, 0, rect.width, rect.height)
     
     pdf.setFillAlpha(op)
+    _reset_fill(pdf)
 
-    # Draw background - whether solid color, gradient, or image
-    if grad:
-        # Draw gradient step by step as a more accurate representation
-        step_count = 50  # More steps for smoother gradients
-        for step in range(step_count):
-            ratio = step / (step_count - 1) if step_count > 1 else 0
-            # Interpolate between colors for smooth gradient
-            if len(grad) >= 2:
-                # Simple two-color gradient interpolation
-                start_color, end_color = grad[0][0], grad[-1][0]
-                interp_r = start_color.red + (end_color.red - start_color.red) * ratio
-                interp_g = start_color.green + (end_color.green - start_color.green) * ratio
-                interp_b = start_color.blue + (end_color.blue - start_color.blue) * ratio
-                interp_color = Color(interp_r, interp_g, interp_b)
-                pdf.setFillColor(interp_color)
-                
-                # Draw a small slice of the gradient
-                y_pos = ratio * adjusted_rect.height
-                pdf.rect(0, y_pos, adjusted_rect.width, adjusted_rect.height / step_count, fill=1, stroke=0)
+    if form_name is None:
+        _draw_block_content(pdf, block, rect.width, rect.height, grad, col, img, op)
     else:
-        col = _parse_color(bg, None)
-        if col:
-            pdf.setFillColor(col)
-            pdf.rect(0, 0, adjusted_rect.width, adjusted_rect.height, fill=1, stroke=0)
-
-    if img:
-        # Draw image with the exact dimensions of the block
-        # Use higher quality image rendering without resampling artifacts
-        pdf.drawImage(img, 0, 0, adjusted_rect.width, adjusted_rect.height, 
-                     preserveAspectRatio=True, anchor='c', mask='auto')
-    else:
-        typ = block.get("typography", {}) or {}
-        if isinstance(typ, dict):
-            # Calculate the text area within the block
-            text_rect = Rect(0, 0, adjusted_rect.width, adjusted_rect.height)
-            _draw_text_block(pdf, block, text_rect, typ)
+        if not reuse_form:
+            # Generous bounds so overflowing text is not clipped by the form's BBox.
+            extent = 2 * (rect.width + rect.height + (pw or 0) + ph)
+            pdf.beginForm(form_name, -extent, -extent, extent, extent)
+            _draw_block_content(pdf, block, rect.width, rect.height, grad, col, img, op)
+            pdf.endForm()
+            _reset_fill(pdf)
+        pdf.doForm(form_name)
 
     pdf.restoreState()
+    _reset_fill(pdf)
 
 def _sort_blocks(blocks: Iterable[Dict[str, Any]]):
-    def key(b):
-        return (float(b.get("compositeZ", b.get("zIndex", 0))), b.get("id", ""))
-    return sorted(blocks, key=key)
+    keyed = [
+        ((_coerce_float(b.get("compositeZ", b.get("zIndex", 0)), 0.0), b.get("id", "")), b)
+        for b in blocks
+    ]
+    keyed.sort(key=operator.itemgetter(0))
+    return [b for _, b in keyed]
 
 def _normalize_pages(layout: Dict[str, Any]):
     pages = layout.get("pages", [])
@@ -303,53 +571,149 @@ def _resolve_page_dimensions(layout: Dict[str, Any], page: Dict[str, Any]):
     total_height = height + (CANVAS_PADDING * 2)
     return total_width, total_height
 
-def render_layout_to_pdf(layout: Dict[str, Any], *, project_name=None, asset_base=None, persist=False):
-    _require_reportlab()
-    if not isinstance(layout, dict):
-        raise PdfExportError("Invalid layout payload.")
-
-    pages = _normalize_pages(layout)
-    asset_root = Path(asset_base) if asset_base else None
-
-    buf = io.BytesIO()
+def _new_canvas(target: Any, project_name=None) -> canvas.Canvas:
     # Create PDF canvas with higher quality parameters
-    pdf = canvas.Canvas(buf)
-    
+    pdf = canvas.Canvas(target)
     # Set higher quality rendering parameters
     pdf.setPageCompression(1) # Enable compression for smaller files
     pdf.setAuthor("Fiona Editorial Studio")
     pdf.setTitle(f"Layout Export - {project_name or 'Untitled'}")
     pdf.setSubject("Editorial Layout")
+    return pdf
 
-    for i, page in enumerate(pages):
-        blocks = _sort_blocks(page.get("blocks", []))
-        pw, ph = _resolve_page_dimensions(layout, page)
-        pdf.setPageSize((pw, ph))
-        
-        # Draw a white background to match the canvas appearance
-        pdf.setFillColorRGB(1, 1, 1)  # White background
-        pdf.rect(0, 0, pw, ph, fill=1, stroke=0)
-        
-        # Draw all blocks on the page
-        for blk in blocks:
-            _draw_block(pdf, blk, ph, asset_root)
-        
-        if i < len(pages)-1:
-            pdf.showPage()
+def _block_form_key(block: Dict[str, Any]) -> Optional[str]:
+    pos = block.get("position")
+    content = block.get("content")
+    if not isinstance(pos, dict) or not isinstance(content, str) or len(content) < _FORM_MIN_TEXT:
+        return None
+    # ReportLab forms carry no shading resources, and images are already shared XObjects.
+    bg = block.get("background")
+    if (isinstance(bg, str) and bg.startswith("linear-gradient")) or content.startswith(("data:image/", "http://", "https://", "file://")) or block.get("rawPath"):
+        return None
+    # Placement, stacking and rotation are applied outside the form.
+    payload = {k: v for k, v in block.items() if k not in _FORM_PLACEMENT_KEYS}
+    payload["size"] = [pos.get("width"), pos.get("height")]
+    try:
+        encoded = json.dumps(payload, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+def _shared_block_forms(pages: List[Dict[str, Any]]) -> Dict[int, str]:
+    """Map blocks whose content repeats on two or more pages to a shared form name."""
+    keyed: Dict[str, List[Dict[str, Any]]] = {}
+    page_counts: Dict[str, int] = {}
+    for page in pages:
+        seen = set()
+        for blk in page.get("blocks", []) or []:
+            if not isinstance(blk, dict):
+                continue
+            key = _block_form_key(blk)
+            if key is None:
+                continue
+            keyed.setdefault(key, []).append(blk)
+            if key not in seen:
+                seen.add(key)
+                page_counts[key] = page_counts.get(key, 0) + 1
+    return {
+        id(blk): f"blk{key}"
+        for key, blks in keyed.items()
+        if page_counts[key] >= 2
+        for blk in blks
+    }
+
+def _draw_page(pdf: canvas.Canvas, layout: Dict[str, Any], page: Dict[str, Any], asset_root: Optional[Path], image_cache: Dict[str, Optional[ImageReader]], forms: Optional[Dict[int, str]] = None, asset_files: Optional[Dict[str, Path]] = None):
+    blocks = _sort_blocks(page.get("blocks", []))
+    pw, ph = _resolve_page_dimensions(layout, page)
+    pdf.setPageSize((pw, ph))
+    
+    # Draw a white background to match the canvas appearance
+    pdf.setFillColorRGB(1, 1, 1)  # White background
+    pdf.rect(0, 0, pw, ph, fill=1, stroke=0)
+    
+    # Draw all blocks on the page
+    for blk in blocks:
+        _draw_block(pdf, blk, ph, asset_root, image_cache, pw, forms, asset_files)
+
+def _render_page_pdf(layout: Dict[str, Any], page: Dict[str, Any], asset_root: Optional[Path], asset_files: Optional[Dict[str, Path]] = None) -> bytes:
+    pdf = canvas.Canvas(None)
+    pdf.setPageCompression(1)
+    _draw_page(pdf, layout, page, asset_root, {}, None, asset_files)
+    return pdf.getpdfdata()
+
+def _render_pages_parallel(layout: Dict[str, Any], pages: List[Dict[str, Any]], asset_root: Optional[Path], project_name, workers: int, path: Optional[Path], asset_files: Optional[Dict[str, Path]] = None) -> Optional[bytes]:
+    import fitz  # PyMuPDF merges the per-page documents
+
+    # Workers only need the page and the layout-level dimensions.
+    page_layout = {"dimensions": layout.get("dimensions") or {}}
+    with ProcessPoolExecutor(max_workers=min(len(pages), workers)) as pool:
+        chunks = list(pool.map(_render_page_pdf, [page_layout] * len(pages), pages, [asset_root] * len(pages), [asset_files] * len(pages)))
+
+    merged = fitz.open()
+    for chunk in chunks:
+        with fitz.open(stream=chunk, filetype="pdf") as part:
+            merged.insert_pdf(part)
+    merged.set_metadata({
+        "author": "Fiona Editorial Studio",
+        "title": f"Layout Export - {project_name or 'Untitled'}",
+        "subject": "Editorial Layout",
+    })
+    try:
+        if path is not None:
+            merged.save(str(path), garbage=1, deflate=True)
+            return None
+        return merged.tobytes(garbage=1, deflate=True)
+    finally:
+        merged.close()
 
-    pdf.save()
-    buf.seek(0)
-    data = buf.read()
+def render_layout_to_pdf(layout: Dict[str, Any], *, project_name=None, asset_base=None, persist=False, return_bytes=True, workers=None):
+    _require_reportlab()
+    if not isinstance(layout, dict):
+        raise PdfExportError("Invalid layout payload.")
+
+    pages = _normalize_pages(layout)
+    asset_root = Path(asset_base) if asset_base else None
+    workers = PDF_EXPORT_WORKERS if workers is None else max(1, int(workers))
+    # One directory walk replaces a stat per image block.
+    asset_files = _scan_asset_files(asset_root) if asset_root and _uses_raw_paths(pages) else None
 
     path = None
     if persist and asset_root:
         outdir = asset_root / "exports"
-        outdir.mkdir(parents=True, exist_ok=True)
-        ts = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        if outdir not in _EXPORT_DIRS_READY:
+            outdir.mkdir(parents=True, exist_ok=True)
+            _EXPORT_DIRS_READY.add(outdir)
+        ts = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
         name = f"{project_name or 'layout'}-{ts}.pdf"
         path = outdir / name
-        path.write_bytes(data)
 
+    if workers > 1 and len(pages) > 1:
+        if return_bytes:
+            data = _render_pages_parallel(layout, pages, asset_root, project_name, workers, None, asset_files)
+            if path is not None:
+                path.write_bytes(data)
+        else:
+            data = _render_pages_parallel(layout, pages, asset_root, project_name, workers, path, asset_files)
+        return data, path
+
+    image_cache: Dict[str, Optional[ImageReader]] = {}
+    forms = _shared_block_forms(pages) if len(pages) > 1 else None
+    _prefetch_images(pages, asset_root, image_cache, asset_files)
+    pdf = _new_canvas(str(path) if path is not None else None, project_name)
+
+    for i, page in enumerate(pages):
+        _draw_page(pdf, layout, page, asset_root, image_cache, forms, asset_files)
+        if i < len(pages)-1:
+            pdf.showPage()
+
+    # ReportLab always builds the whole document as one bytes object, so take it
+    # directly instead of copying it through a BytesIO or reading the file back.
+    if path is not None and not return_bytes:
+        pdf.save()
+        return None, path
+    data = pdf.getpdfdata()
+    if path is not None:
+        path.write_bytes(data)
     return data, path
 
 __all__ = ["render_layout_to_pdf", "PdfExportError"]